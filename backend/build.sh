@@ -10,6 +10,6 @@ echo "\nDownloading dependencies..."
 go mod download
 
 echo "\nBuilding application..."
-CGO_ENABLED=0 GOOS=linux GOARCH=amd64 go build -v -o app
+CGO_ENABLED=0 GOOS=linux GOARCH=amd64 go build -v -tags=go_json -o app
 
 echo "\nBuild complete!"
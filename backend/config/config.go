@@ -3,6 +3,8 @@ package config
 import (
 	"fmt"
 	"os"
+	"strconv"
+	"time"
 
 	"github.com/joho/godotenv"
 	"gorm.io/driver/postgres"
@@ -75,9 +77,13 @@ func InitDB(cfg *Config) (*gorm.DB, error) {
 		return nil, fmt.Errorf("failed to get database instance: %w", err)
 	}
 
-	// Set reasonable pool settings
-	sqlDB.SetMaxIdleConns(10)
-	sqlDB.SetMaxOpenConns(100)
+	// Keep enough idle connections to absorb request bursts without paying a
+	// fresh TCP+TLS+auth handshake, and recycle them before the Neon pooler
+	// drops them server-side
+	sqlDB.SetMaxOpenConns(getEnvInt("DB_MAX_OPEN_CONNS", 50))
+	sqlDB.SetMaxIdleConns(getEnvInt("DB_MAX_IDLE_CONNS", 25))
+	sqlDB.SetConnMaxIdleTime(5 * time.Minute)
+	sqlDB.SetConnMaxLifetime(30 * time.Minute)
 
 	// Verify connection
 	if err := sqlDB.Ping(); err != nil {
@@ -94,3 +100,11 @@ func getEnv(key, defaultValue string) string {
 	}
 	return defaultValue
 }
+
+// getEnvInt gets an integer environment variable or returns the default value
+func getEnvInt(key string, defaultValue int) int {
+	if value, err := strconv.Atoi(os.Getenv(key)); err == nil && value > 0 {
+		return value
+	}
+	return defaultValue
+}
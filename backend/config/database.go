@@ -104,6 +104,53 @@ func InitializeDatabase(db *gorm.DB) error {
 	return nil
 }
 
+// historyIndexes back the newest-first per-address transaction history
+// query. Each is built CONCURRENTLY so a populated transactions table keeps
+// taking writes while it is created.
+var historyIndexes = []struct {
+	Name       string
+	Definition string
+}{
+	{"idx_transactions_from_created", `ON "transactions"("from_address", "created_at" DESC)`},
+	{"idx_transactions_to_created", `ON "transactions"("to_address", "created_at" DESC)`},
+}
+
+// EnsureIndexes creates any missing performance indexes. It can take a long
+// time on a large table, so run it in the background once the schema has
+// validated rather than ahead of serving traffic. A failed concurrent build
+// leaves an INVALID index behind that IF NOT EXISTS would skip forever, so
+// invalid indexes are dropped and rebuilt. Failures are only logged: the
+// queries still work without the indexes, just more slowly.
+func EnsureIndexes(db *gorm.DB) {
+	for _, idx := range historyIndexes {
+		var existing []struct{ Indisvalid bool }
+		if err := db.Raw(`SELECT i.indisvalid FROM pg_index i
+			JOIN pg_class c ON c.oid = i.indexrelid
+			JOIN pg_namespace n ON n.oid = c.relnamespace
+			WHERE c.relname = ? AND n.nspname = current_schema()`, idx.Name).Scan(&existing).Error; err != nil {
+			log.Printf("Warning: Failed to check index %s: %v", idx.Name, err)
+			continue
+		}
+		if len(existing) > 0 {
+			if existing[0].Indisvalid {
+				continue
+			}
+			log.Printf("Index %s is invalid, rebuilding", idx.Name)
+			if err := db.Exec(fmt.Sprintf(`DROP INDEX CONCURRENTLY IF EXISTS "%s"`, idx.Name)).Error; err != nil {
+				log.Printf("Warning: Failed to drop invalid index %s: %v", idx.Name, err)
+				continue
+			}
+		}
+
+		log.Printf("Creating index %s...", idx.Name)
+		if err := db.Exec(fmt.Sprintf(`CREATE INDEX CONCURRENTLY IF NOT EXISTS "%s" %s`, idx.Name, idx.Definition)).Error; err != nil {
+			log.Printf("Warning: Failed to create index %s: %v", idx.Name, err)
+			continue
+		}
+		log.Printf("Index %s ready", idx.Name)
+	}
+}
+
 // seedDevelopmentData adds test data if needed (development only)
 func seedDevelopmentData(db *gorm.DB) error {
 	// Only seed if we're in development mode and the tables are empty
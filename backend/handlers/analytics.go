@@ -6,33 +6,57 @@ import (
 	"fmt"
 	"net/http"
 	"strconv"
+	"strings"
 	"time"
 
 	"github.com/gin-gonic/gin"
+	"github.com/goccy/go-json"
+)
+
+// Wallet analytics response cache settings. The frontend polls the same
+// address repeatedly; a short TTL absorbs the bursts while keeping data fresh.
+const (
+	analyticsCacheSize = 2048
+	analyticsCacheTTL  = 30 * time.Second
 )
 
 // WalletAnalyticsHandler handles wallet analytics data requests
 type WalletAnalyticsHandler struct {
 	analyticsService *services.WalletAnalyticsService
+	responses        *services.TTLCache[string, []byte]
 }
 
 // NewWalletAnalyticsHandler creates a new wallet analytics handler
 func NewWalletAnalyticsHandler(analyticsService *services.WalletAnalyticsService) *WalletAnalyticsHandler {
 	return &WalletAnalyticsHandler{
 		analyticsService: analyticsService,
+		responses:        services.NewTTLCache[string, []byte](analyticsCacheSize, analyticsCacheTTL),
+	}
+}
+
+// walletAddressParam returns the wallet address from the route path, falling
+// back to the ?address= query. The routes always bind :address, so checking
+// the path first avoids parsing the query string on every request.
+func walletAddressParam(c *gin.Context) string {
+	if address := c.Param("address"); address != "" {
+		return address
 	}
+	return c.Query("address")
 }
 
 // GetWalletAnalytics returns analytics data for the specified wallet address
 func (h *WalletAnalyticsHandler) GetWalletAnalytics(c *gin.Context) {
-	address := c.Query("address")
+	address := walletAddressParam(c)
 	if address == "" {
-		// Check if the address is in the path
-		address = c.Param("address")
-		if address == "" {
-			c.JSON(http.StatusBadRequest, gin.H{"error": "Wallet address is required"})
-			return
-		}
+		c.JSON(http.StatusBadRequest, gin.H{"error": "Wallet address is required"})
+		return
+	}
+
+	// Serve the already-encoded response if this address was looked up recently
+	cacheKey := strings.ToLower(address)
+	if body, ok := h.responses.Get(cacheKey); ok {
+		c.Data(http.StatusOK, jsonContentType, body)
+		return
 	}
 
 	// Get analytics for the address
@@ -42,19 +66,22 @@ func (h *WalletAnalyticsHandler) GetWalletAnalytics(c *gin.Context) {
 		return
 	}
 
-	c.JSON(http.StatusOK, analytics)
+	body, err := json.Marshal(analytics)
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, gin.H{"error": "Failed to encode wallet analytics"})
+		return
+	}
+	h.responses.Set(cacheKey, body)
+
+	c.Data(http.StatusOK, jsonContentType, body)
 }
 
 // GetWalletRiskScore returns a risk score for the wallet based on its analytics
 func (h *WalletAnalyticsHandler) GetWalletRiskScore(c *gin.Context) {
-	address := c.Query("address")
+	address := walletAddressParam(c)
 	if address == "" {
-		// Check if the address is in the path
-		address = c.Param("address")
-		if address == "" {
-			c.JSON(http.StatusBadRequest, gin.H{"error": "Wallet address is required"})
-			return
-		}
+		c.JSON(http.StatusBadRequest, gin.H{"error": "Wallet address is required"})
+		return
 	}
 
 	// Get analytics for the address
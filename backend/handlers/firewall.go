@@ -3,6 +3,7 @@ package handlers
 import (
 	"Wallet/backend/models"
 	"Wallet/backend/services"
+	"database/sql"
 	"log"
 	"net/http"
 	"time"
@@ -11,6 +12,21 @@ import (
 	"gorm.io/gorm"
 )
 
+// transactionHistoryLimit caps the number of transactions returned per wallet
+const transactionHistoryLimit = 50
+
+const jsonContentType = "application/json; charset=utf-8"
+
+// Pre-encoded error bodies for the firewall endpoints. They never change, so
+// encoding them once avoids a map allocation and JSON encode per failure.
+var (
+	errBodyInvalidRequest          = []byte(`{"error":"Invalid request format"}`)
+	errBodyAnalyzeFailed           = []byte(`{"error":"Failed to analyze transaction"}`)
+	errBodyAnalyzeHighValueFailed  = []byte(`{"error":"Failed to analyze high-value transaction"}`)
+	errBodyNotAuthenticated        = []byte(`{"error":"Not authenticated"}`)
+	errBodyFetchTransactionsFailed = []byte(`{"error":"Failed to fetch transactions"}`)
+)
+
 // FirewallHandler handles transaction firewall endpoints
 type FirewallHandler struct {
 	db        *gorm.DB
@@ -29,14 +45,14 @@ func NewFirewallHandler(db *gorm.DB, aiService *services.AIService) *FirewallHan
 func (h *FirewallHandler) AnalyzeTransaction(c *gin.Context) {
 	var tx models.Transaction
 	if err := c.ShouldBindJSON(&tx); err != nil {
-		c.JSON(http.StatusBadRequest, gin.H{"error": "Invalid request format"})
+		c.Data(http.StatusBadRequest, jsonContentType, errBodyInvalidRequest)
 		return
 	}
 
 	// Call AI service to analyze transaction
-	risk, err := h.aiService.AnalyzeTransaction(tx)
+	risk, err := h.aiService.AnalyzeTransaction(c.Request.Context(), tx)
 	if err != nil {
-		c.JSON(http.StatusInternalServerError, gin.H{"error": "Failed to analyze transaction"})
+		c.Data(http.StatusInternalServerError, jsonContentType, errBodyAnalyzeFailed)
 		return
 	}
 
@@ -68,14 +84,14 @@ func (h *FirewallHandler) AnalyzeTransaction(c *gin.Context) {
 func (h *FirewallHandler) AnalyzeHighValueTransaction(c *gin.Context) {
 	var tx models.Transaction
 	if err := c.ShouldBindJSON(&tx); err != nil {
-		c.JSON(http.StatusBadRequest, gin.H{"error": "Invalid request format"})
+		c.Data(http.StatusBadRequest, jsonContentType, errBodyInvalidRequest)
 		return
 	}
 
 	// Call AI service to analyze high-value transaction with enhanced scrutiny
-	risk, err := h.aiService.AnalyzeTransactionEnhanced(tx)
+	risk, err := h.aiService.AnalyzeTransactionEnhanced(c.Request.Context(), tx)
 	if err != nil {
-		c.JSON(http.StatusInternalServerError, gin.H{"error": "Failed to analyze high-value transaction"})
+		c.Data(http.StatusInternalServerError, jsonContentType, errBodyAnalyzeHighValueFailed)
 		return
 	}
 
@@ -109,17 +125,23 @@ func (h *FirewallHandler) AnalyzeHighValueTransaction(c *gin.Context) {
 
 // GetStats returns transaction security statistics
 func (h *FirewallHandler) GetStats(c *gin.Context) {
-	var safeCount, suspiciousCount, blockedCount int64
-
-	h.db.Model(&models.Transaction{}).Where("status = ?", "safe").Count(&safeCount)
-	h.db.Model(&models.Transaction{}).Where("status = ?", "suspicious").Count(&suspiciousCount)
-	h.db.Model(&models.Transaction{}).Where("status = ?", "blocked").Count(&blockedCount)
+	// One round trip: count every status bucket in a single scan
+	var counts struct {
+		Safe       int64
+		Suspicious int64
+		Blocked    int64
+	}
+	h.db.Model(&models.Transaction{}).
+		Select(`COUNT(*) FILTER (WHERE status = 'safe') AS safe,
+			COUNT(*) FILTER (WHERE status = 'suspicious') AS suspicious,
+			COUNT(*) FILTER (WHERE status = 'blocked') AS blocked`).
+		Scan(&counts)
 
 	c.JSON(http.StatusOK, gin.H{
-		"safe":       safeCount,
-		"suspicious": suspiciousCount,
-		"blocked":    blockedCount,
-		"total":      safeCount + suspiciousCount + blockedCount,
+		"safe":       counts.Safe,
+		"suspicious": counts.Suspicious,
+		"blocked":    counts.Blocked,
+		"total":      counts.Safe + counts.Suspicious + counts.Blocked,
 	})
 }
 
@@ -128,20 +150,26 @@ func (h *FirewallHandler) GetTransactions(c *gin.Context) {
 	// Get address from Web3 auth middleware
 	address, exists := c.Get("address")
 	if !exists {
-		c.JSON(http.StatusUnauthorized, gin.H{"error": "Not authenticated"})
+		c.Data(http.StatusUnauthorized, jsonContentType, errBodyNotAuthenticated)
 		return
 	}
 
 	walletAddress := address.(string)
 
+	// An OR across two columns can't use either (address, created_at) index
+	// for ordering, so read the newest rows from each side and merge them.
+	// The second branch skips self-transfers already returned by the first.
 	var transactions []models.Transaction
-	result := h.db.Where("from_address = ? OR to_address = ?", walletAddress, walletAddress).
-		Order("created_at DESC").
-		Limit(50).
-		Find(&transactions)
+	result := h.db.Raw(`
+		(SELECT * FROM transactions WHERE from_address = @addr ORDER BY created_at DESC LIMIT @limit)
+		UNION ALL
+		(SELECT * FROM transactions WHERE to_address = @addr AND from_address <> @addr ORDER BY created_at DESC LIMIT @limit)
+		ORDER BY created_at DESC LIMIT @limit`,
+		sql.Named("addr", walletAddress), sql.Named("limit", transactionHistoryLimit)).
+		Scan(&transactions)
 
 	if result.Error != nil {
-		c.JSON(http.StatusInternalServerError, gin.H{"error": "Failed to fetch transactions"})
+		c.Data(http.StatusInternalServerError, jsonContentType, errBodyFetchTransactionsFailed)
 		return
 	}
 
@@ -162,22 +190,43 @@ func (h *FirewallHandler) GetAdminStats(c *gin.Context) {
 		LastDayTransactions     int64 `json:"lastDayTransactions"`
 	}
 
-	// Count different transaction types
-	h.db.Model(&models.Transaction{}).Count(&stats.TotalTransactions)
-	h.db.Model(&models.Transaction{}).Where("status = ?", "blocked").Count(&stats.BlockedTransactions)
-	h.db.Model(&models.Transaction{}).Where("status = ?", "suspicious").Count(&stats.SuspiciousTransactions)
-	h.db.Model(&models.Transaction{}).Where("status = ?", "safe").Count(&stats.SafeTransactions)
-
-	// Count reports
-	h.db.Model(&models.Report{}).Count(&stats.TotalReports)
-	h.db.Model(&models.Report{}).Where("status = ?", "verified").Count(&stats.VerifiedReports)
-
-	// Count unique reported addresses
-	h.db.Model(&models.Report{}).Distinct("reported_address").Count(&stats.UniqueAddressesReported)
-
-	// Count transactions in the last 24 hours
+	// Count transaction types and last-24h volume in a single scan
+	var txCounts struct {
+		Total      int64
+		Blocked    int64
+		Suspicious int64
+		Safe       int64
+		LastDay    int64
+	}
 	yesterday := time.Now().Add(-24 * time.Hour)
-	h.db.Model(&models.Transaction{}).Where("created_at > ?", yesterday).Count(&stats.LastDayTransactions)
+	h.db.Model(&models.Transaction{}).
+		Select(`COUNT(*) AS total,
+			COUNT(*) FILTER (WHERE status = 'blocked') AS blocked,
+			COUNT(*) FILTER (WHERE status = 'suspicious') AS suspicious,
+			COUNT(*) FILTER (WHERE status = 'safe') AS safe,
+			COUNT(*) FILTER (WHERE created_at > ?) AS last_day`, yesterday).
+		Scan(&txCounts)
+
+	// Count reports, verified reports and unique reported addresses together
+	var reportCounts struct {
+		Total     int64
+		Verified  int64
+		Addresses int64
+	}
+	h.db.Model(&models.Report{}).
+		Select(`COUNT(*) AS total,
+			COUNT(*) FILTER (WHERE status = 'verified') AS verified,
+			COUNT(DISTINCT reported_address) AS addresses`).
+		Scan(&reportCounts)
+
+	stats.TotalTransactions = txCounts.Total
+	stats.BlockedTransactions = txCounts.Blocked
+	stats.SuspiciousTransactions = txCounts.Suspicious
+	stats.SafeTransactions = txCounts.Safe
+	stats.LastDayTransactions = txCounts.LastDay
+	stats.TotalReports = reportCounts.Total
+	stats.VerifiedReports = reportCounts.Verified
+	stats.UniqueAddressesReported = reportCounts.Addresses
 
 	// Return all stats
 	c.JSON(http.StatusOK, stats)
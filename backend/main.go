@@ -6,6 +6,7 @@ import (
 	"Wallet/backend/services"
 	"fmt"
 	"log"
+	"net/http"
 	"time"
 
 	"github.com/gin-gonic/gin"
@@ -53,6 +54,8 @@ func main() {
 		log.Println("Continuing anyway - some features may not work correctly")
 	} else {
 		log.Println("Database schema validation successful")
+		// Build missing indexes in the background so startup isn't held up
+		go config.EnsureIndexes(db)
 	}
 
 	// Start on-chain event listener (QuadraticVoting → ConfirmedScam sync)
@@ -85,9 +88,18 @@ func main() {
     Wallet Firewall API Server | Secure Transactions`)
 	fmt.Printf("    Version 1.0.0 | Environment: %s\n\n", cfg.Environment)
 
-	// Start server
+	// Start server. Clients and the Render proxy reuse keep-alive connections;
+	// IdleTimeout reaps abandoned ones and ReadHeaderTimeout stops slow
+	// clients from pinning a connection before a request arrives.
+	server := &http.Server{
+		Addr:              ":" + cfg.ServerPort,
+		Handler:           r,
+		ReadHeaderTimeout: 10 * time.Second,
+		IdleTimeout:       120 * time.Second,
+	}
+
 	log.Printf("Server listening on port %s", cfg.ServerPort)
-	if err := r.Run(":" + cfg.ServerPort); err != nil {
+	if err := server.ListenAndServe(); err != nil {
 		log.Fatalf("Failed to start server: %v", err)
 	}
 }
@@ -32,7 +32,7 @@ switch ($choice) {
         if ($hasGo) {
             Write-Host "`nBuilding Go application locally..." -ForegroundColor Cyan
             $env:CGO_ENABLED = 0
-            go build -o app.exe .
+            go build -tags=go_json -o app.exe .
             if ($LASTEXITCODE -eq 0) {
                 Write-Host "`nBuild successful!" -ForegroundColor Green
                 Write-Host "Running the application locally..." -ForegroundColor Yellow
@@ -6,7 +6,7 @@ CURRENT_DIR=$(pwd)
 
 # Build the Go application
 echo "Building Go application..."
-CGO_ENABLED=0 go build -o app .
+CGO_ENABLED=0 go build -tags=go_json -o app .
 
 # Check if build was successful
 if [ $? -ne 0 ]; then
@@ -55,6 +55,12 @@ func SetupMainRouter(db *gorm.DB) *gin.Engine {
 	}
 
 	aiService := services.NewAIServiceWithDB(analyticsService, db)
+	// Keep the Render-hosted ML model warm so user requests skip its cold
+	// start. Only in production (config's default when ENVIRONMENT is unset)
+	// so local and test runs don't ping the shared endpoint.
+	if env := os.Getenv("ENVIRONMENT"); env == "" || env == "production" {
+		aiService.StartKeepWarm()
+	}
 
 	// Initialize SBT service
 	sbtService, sbtErr := services.NewSBTService(db)
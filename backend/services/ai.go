@@ -3,21 +3,70 @@ package services
 import (
 	"Wallet/backend/models"
 	"bytes"
+	"context"
 	"encoding/json"
 	"fmt"
+	"log"
+	"math"
 	"math/big"
 	"net/http"
+	"os"
 	"strings"
+	"sync"
 	"time"
 
 	"gorm.io/gorm"
 )
 
+// ML prediction cache settings. The deployed model is deterministic for a
+// given request, so repeat lookups within the TTL skip the upstream call.
+const (
+	predictionCacheSize = 10000
+	predictionCacheTTL  = 5 * time.Minute
+)
+
+// Transfers below safeTransferMaxValue ETH to an address listed in
+// ML_SAFE_ADDRESSES are scored safeTransferRisk without calling the ML API.
+const (
+	safeTransferMaxValue = 0.0001
+	safeTransferRisk     = 0.05
+)
+
+// mlKeepWarmInterval re-pings the ML API well inside Render's 15 minute
+// free-tier idle window; keepWarmAddress is the dummy address it sends.
+const (
+	mlKeepWarmInterval = 4 * time.Minute
+	keepWarmAddress    = "0x0000000000000000000000000000000000000000"
+)
+
+// defaultGasPrice is the gas price metadata sent with every ML request
+const defaultGasPrice = 20.0
+
 // AIService provides machine learning model access for transaction analysis
 type AIService struct {
 	modelURL         string
+	client           *http.Client
+	predictions      *TTLCache[predictionKey, float64]
+	safeAddresses    map[string]struct{}
 	analyticsService *WalletAnalyticsService
 	db               *gorm.DB
+
+	inflightMu sync.Mutex
+	inflight   map[predictionKey]*sharedPrediction
+
+	oracleMu sync.Mutex
+	oracle   *OracleService
+}
+
+// sharedPrediction is one upstream ML call shared by every concurrent caller
+// asking for the same prediction key. waiters is guarded by
+// AIService.inflightMu; risk and err are written once before done closes.
+type sharedPrediction struct {
+	done    chan struct{}
+	cancel  context.CancelFunc
+	waiters int
+	risk    float64
+	err     error
 }
 
 // NewAIService creates a new AI service instance
@@ -27,10 +76,25 @@ func NewAIService(analyticsService *WalletAnalyticsService) *AIService {
 
 	return &AIService{
 		modelURL:         modelURL,
+		client:           mlHTTPClient,
+		predictions:      NewTTLCache[predictionKey, float64](predictionCacheSize, predictionCacheTTL),
+		inflight:         make(map[predictionKey]*sharedPrediction),
+		safeAddresses:    parseAddressSet(os.Getenv("ML_SAFE_ADDRESSES")),
 		analyticsService: analyticsService,
 	}
 }
 
+// parseAddressSet parses a comma-separated address list into a lower-cased set
+func parseAddressSet(list string) map[string]struct{} {
+	set := make(map[string]struct{})
+	for _, addr := range strings.Split(list, ",") {
+		if addr = strings.ToLower(strings.TrimSpace(addr)); addr != "" {
+			set[addr] = struct{}{}
+		}
+	}
+	return set
+}
+
 // NewAIServiceWithDB creates an AI service with direct database access for DAO queries
 func NewAIServiceWithDB(analyticsService *WalletAnalyticsService, db *gorm.DB) *AIService {
 	svc := NewAIService(analyticsService)
@@ -50,6 +114,22 @@ type AIModelRequest struct {
 	Features              []interface{} `json:"features"`
 }
 
+// mlRequestTemplate holds the metadata fields that are identical for every
+// ML request; predictMLRisk copies it and fills in the per-transaction fields.
+var mlRequestTemplate = AIModelRequest{
+	GasPrice:              defaultGasPrice,
+	IsContractInteraction: false,
+}
+
+// defaultFeatures is the zero-valued 18-feature vector: 16 numeric features
+// followed by the two ERC20 token-type strings at positions 16 and 17.
+var defaultFeatures = [18]interface{}{
+	0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+	0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+	"", // erc20_most_sent_token_type (string)
+	"", // erc20_most_rec_token_type (string)
+}
+
 // AIModelResponse represents the prediction response from the AI model
 type AIModelResponse struct {
 	Risk        float64            `json:"risk_score"`
@@ -58,10 +138,139 @@ type AIModelResponse struct {
 	Features    map[string]float64 `json:"feature_importance"`
 }
 
+// predictionKey identifies an ML prediction by the request fields the model
+// output depends on. Value and gas price are rounded so float noise from the
+// frontend does not defeat the cache.
+type predictionKey struct {
+	fromAddress string
+	toAddress   string
+	value       float64
+	gasPrice    float64
+	isContract  bool
+}
+
+// newPredictionKey builds the prediction cache key for a transaction
+func newPredictionKey(tx models.Transaction, gasPrice float64, isContract bool) predictionKey {
+	return predictionKey{
+		fromAddress: strings.ToLower(tx.FromAddress),
+		toAddress:   strings.ToLower(tx.ToAddress),
+		value:       math.Round(tx.Value*1e6) / 1e6,
+		gasPrice:    math.Round(gasPrice*1e4) / 1e4,
+		isContract:  isContract,
+	}
+}
+
 // AnalyzeTransaction calls the deployed Render ML API + DAO scam database.
 // We own ZERO ml code — the model lives at ml-fraud-transaction-detection.onrender.com.
 // Our job: send the best possible 18-feature payload, then layer DAO data on top.
-func (s *AIService) AnalyzeTransaction(tx models.Transaction) (float64, error) {
+// The upstream call is bound to its callers' contexts: once every caller
+// waiting on it has gone away (client disconnect, handler timeout) it is
+// cancelled, releasing the pooled connection and ML slot immediately
+// instead of waiting out the full ML timeout.
+func (s *AIService) AnalyzeTransaction(ctx context.Context, tx models.Transaction) (float64, error) {
+	// Only successful ML predictions built from real wallet analytics are
+	// cached; the DAO boost is always recomputed so newly confirmed scams
+	// take effect immediately.
+	var mlRisk float64
+	if s.isTrivialSafeTransfer(tx) {
+		mlRisk = safeTransferRisk
+	} else {
+		key := newPredictionKey(tx, mlRequestTemplate.GasPrice, mlRequestTemplate.IsContractInteraction)
+		var ok bool
+		if mlRisk, ok = s.predictions.Get(key); !ok {
+			var err error
+			mlRisk, err = s.predictCoalesced(ctx, key, tx)
+			if err != nil {
+				return 0, err
+			}
+		}
+	}
+
+	// ══════════════════════════════════════════════════
+	// FLYWHEEL: Boost risk with DAO-confirmed scam data
+	// ══════════════════════════════════════════════════
+	daoBoost := s.getDAOScamBoost(tx.ToAddress)
+	combinedRisk := mlRisk + daoBoost
+	if combinedRisk > 1.0 {
+		combinedRisk = 1.0
+	}
+
+	return combinedRisk, nil
+}
+
+// isTrivialSafeTransfer reports whether tx is a dust-value transfer to an
+// allowlisted address. Those are deterministically low risk, so the
+// upstream ML call is skipped entirely.
+func (s *AIService) isTrivialSafeTransfer(tx models.Transaction) bool {
+	if tx.Value >= safeTransferMaxValue || len(s.safeAddresses) == 0 {
+		return false
+	}
+	_, ok := s.safeAddresses[strings.ToLower(tx.ToAddress)]
+	return ok
+}
+
+// predictCoalesced collapses concurrent misses for the same prediction key
+// into a single upstream POST; every waiter receives the shared result.
+// The shared call is detached from any one caller's cancellation so a
+// disconnecting client cannot fail the request for the others, but it is
+// cancelled as soon as the last waiter leaves.
+func (s *AIService) predictCoalesced(ctx context.Context, key predictionKey, tx models.Transaction) (float64, error) {
+	s.inflightMu.Lock()
+	call, ok := s.inflight[key]
+	if !ok {
+		// The shared deadline covers the slot wait too
+		callCtx, cancel := context.WithTimeout(context.WithoutCancel(ctx), mlRequestTimeout)
+		call = &sharedPrediction{done: make(chan struct{}), cancel: cancel}
+		s.inflight[key] = call
+		go s.runSharedPrediction(callCtx, key, tx, call)
+	}
+	call.waiters++
+	s.inflightMu.Unlock()
+
+	select {
+	case <-call.done:
+		return call.risk, call.err
+	case <-ctx.Done():
+		s.inflightMu.Lock()
+		call.waiters--
+		if call.waiters == 0 {
+			// Nobody is left to use the result; free the connection and
+			// slot, and let the next caller start a fresh request
+			call.cancel()
+			if s.inflight[key] == call {
+				delete(s.inflight, key)
+			}
+		}
+		s.inflightMu.Unlock()
+		return 0, ctx.Err()
+	}
+}
+
+// runSharedPrediction performs the upstream call for a sharedPrediction and
+// publishes its result to the waiters
+func (s *AIService) runSharedPrediction(ctx context.Context, key predictionKey, tx models.Transaction, call *sharedPrediction) {
+	defer call.cancel()
+
+	mlRisk, complete, err := s.predictMLRisk(ctx, tx)
+	if err == nil && complete {
+		s.predictions.Set(key, mlRisk)
+	}
+
+	s.inflightMu.Lock()
+	if s.inflight[key] == call {
+		delete(s.inflight, key)
+	}
+	s.inflightMu.Unlock()
+
+	call.risk, call.err = mlRisk, err
+	close(call.done)
+}
+
+// predictMLRisk sends the transaction to the external ML API and maps its
+// prediction label to a base risk score. complete reports whether the
+// feature vector was filled from wallet analytics; a prediction made from
+// the zero-feature fallback is degraded and must not be cached.
+func (s *AIService) predictMLRisk(ctx context.Context, tx models.Transaction) (mlRisk float64, complete bool, err error) {
 	// ──────────────────────────────────────────────────
 	// Build the 18-feature vector the deployed model expects.
 	// Feature positions (from the model's training dataset):
@@ -84,14 +293,9 @@ func (s *AIService) AnalyzeTransaction(tx models.Transaction) (float64, error) {
 	//  [16] erc20_most_sent_token_type    (str)
 	//  [17] erc20_most_rec_token_type     (str)
 	// ──────────────────────────────────────────────────
-	features := make([]interface{}, 18)
-	for i := 0; i < 16; i++ {
-		features[i] = 0.0
-	}
-	features[16] = "" // erc20_most_sent_token_type (string)
-	features[17] = "" // erc20_most_rec_token_type (string)
+	features := make([]interface{}, len(defaultFeatures))
+	copy(features, defaultFeatures[:])
 	features[9] = tx.Value // total_ether_sent (current tx as proxy)
-	isContract := false
 
 	// Populate the rest from wallet analytics (DB + RPC data we already collect).
 	// This is NOT adding ML code — it's filling the request with real data
@@ -99,6 +303,7 @@ func (s *AIService) AnalyzeTransaction(tx models.Transaction) (float64, error) {
 	// Analyze the RECIPIENT's wallet — that's who we're evaluating for fraud.
 	if s.analyticsService != nil {
 		if wa, err := s.analyticsService.GetWalletAnalytics(tx.ToAddress); err == nil && wa != nil {
+			complete = true
 			features[0] = wa.AvgMinBetweenSentTx
 			features[1] = wa.AvgMinBetweenReceivedTx
 			features[2] = wa.TimeDiffFirstLastMins
@@ -121,30 +326,58 @@ func (s *AIService) AnalyzeTransaction(tx models.Transaction) (float64, error) {
 		// If analytics fails we still have [9] (tx value) — same as before, no worse.
 	}
 
-	request := AIModelRequest{
-		FromAddress:           tx.FromAddress,
-		ToAddress:             tx.ToAddress,
-		TransactionValue:      tx.Value,
-		GasPrice:              20.0, // default gas price for metadata
-		IsContractInteraction: isContract,
-		AccHolder:             tx.ToAddress, // Evaluate the RECIPIENT address
-		Features:              features,
+	request := mlRequestTemplate
+	request.FromAddress = tx.FromAddress
+	request.ToAddress = tx.ToAddress
+	request.TransactionValue = tx.Value
+	request.AccHolder = tx.ToAddress // Evaluate the RECIPIENT address
+	request.Features = features
+
+	prediction, err := s.callModel(ctx, request)
+	if err != nil {
+		return 0, false, err
+	}
+
+	switch prediction {
+	case "Fraud":
+		mlRisk = 0.85
+	case "Suspicious":
+		mlRisk = 0.50
+	default:
+		mlRisk = 0.10
 	}
 
+	return mlRisk, complete, nil
+}
+
+// callModel POSTs a prepared request to the ML API and returns the raw
+// prediction label ("Fraud", "Suspicious", ...).
+func (s *AIService) callModel(ctx context.Context, request AIModelRequest) (string, error) {
 	jsonData, err := json.Marshal(request)
 	if err != nil {
-		return 0, fmt.Errorf("error marshaling request: %w", err)
+		return "", fmt.Errorf("error marshaling request: %w", err)
 	}
 
-	client := &http.Client{Timeout: 30 * time.Second}
-	resp, err := client.Post(s.modelURL, "application/json", bytes.NewBuffer(jsonData))
+	req, err := http.NewRequestWithContext(ctx, http.MethodPost, s.modelURL, bytes.NewBuffer(jsonData))
 	if err != nil {
-		return 0, fmt.Errorf("error calling ML model: %w", err)
+		return "", fmt.Errorf("error building ML request: %w", err)
 	}
-	defer resp.Body.Close()
+	req.Header.Set("Content-Type", "application/json")
+
+	release, err := acquireMLSlot(ctx)
+	if err != nil {
+		return "", fmt.Errorf("waiting for ML slot: %w", err)
+	}
+	defer release()
+
+	resp, err := s.client.Do(req)
+	if err != nil {
+		return "", fmt.Errorf("error calling ML model: %w", err)
+	}
+	defer drainAndClose(resp.Body)
 
 	if resp.StatusCode != http.StatusOK {
-		return 0, fmt.Errorf("ML model returned non-OK status: %d", resp.StatusCode)
+		return "", fmt.Errorf("ML model returned non-OK status: %d", resp.StatusCode)
 	}
 
 	var externalResponse struct {
@@ -152,29 +385,44 @@ func (s *AIService) AnalyzeTransaction(tx models.Transaction) (float64, error) {
 		Type       string `json:"Type"`
 	}
 	if err := json.NewDecoder(resp.Body).Decode(&externalResponse); err != nil {
-		return 0, fmt.Errorf("error decoding model response: %w", err)
+		return "", fmt.Errorf("error decoding model response: %w", err)
 	}
 
-	var mlRisk float64
-	switch externalResponse.Prediction {
-	case "Fraud":
-		mlRisk = 0.85
-	case "Suspicious":
-		mlRisk = 0.50
-	default:
-		mlRisk = 0.10
-	}
+	return externalResponse.Prediction, nil
+}
 
-	// ══════════════════════════════════════════════════
-	// FLYWHEEL: Boost risk with DAO-confirmed scam data
-	// ══════════════════════════════════════════════════
-	daoBoost := s.getDAOScamBoost(tx.ToAddress)
-	combinedRisk := mlRisk + daoBoost
-	if combinedRisk > 1.0 {
-		combinedRisk = 1.0
-	}
+// StartKeepWarm pings the ML API now and then every mlKeepWarmInterval for
+// the life of the process. Render's free tier idles the model after 15
+// minutes and the next real request pays the cold start; the pings keep the
+// instance (and a pooled TLS connection to it) warm for user traffic.
+func (s *AIService) StartKeepWarm() {
+	go func() {
+		ticker := time.NewTicker(mlKeepWarmInterval)
+		defer ticker.Stop()
+
+		for {
+			s.pingModel()
+			<-ticker.C
+		}
+	}()
+}
 
-	return combinedRisk, nil
+// pingModel sends a feature-shaped dummy prediction request to the ML API
+func (s *AIService) pingModel() {
+	ctx, cancel := context.WithTimeout(context.Background(), mlRequestTimeout)
+	defer cancel()
+
+	request := mlRequestTemplate
+	request.FromAddress = keepWarmAddress
+	request.ToAddress = keepWarmAddress
+	request.AccHolder = keepWarmAddress
+	features := make([]interface{}, len(defaultFeatures))
+	copy(features, defaultFeatures[:])
+	request.Features = features
+
+	if _, err := s.callModel(ctx, request); err != nil {
+		log.Printf("Warning: ML keep-warm ping failed: %v", err)
+	}
 }
 
 // weiToEth converts a big.Int string (Wei) to float64 ETH. Returns 0 on error.
@@ -190,6 +438,23 @@ func weiToEth(s string) float64 {
 	return eth
 }
 
+// oracleService returns the shared oracle client, dialing it on first use.
+// A failed dial is not cached so the next lookup retries the connection.
+func (s *AIService) oracleService() (*OracleService, error) {
+	s.oracleMu.Lock()
+	defer s.oracleMu.Unlock()
+
+	if s.oracle != nil {
+		return s.oracle, nil
+	}
+	oracle, err := NewOracleService()
+	if err != nil {
+		return nil, err
+	}
+	s.oracle = oracle
+	return oracle, nil
+}
+
 // getDAOScamBoost queries the DAO confirmed scam database and returns a risk boost.
 // This is the core of the self-improving flywheel: community-curated data improves ML scoring.
 func (s *AIService) getDAOScamBoost(address string) float64 {
@@ -207,7 +472,7 @@ func (s *AIService) getDAOScamBoost(address string) float64 {
 	}
 
 	// Fallback: check on-chain directly (catches events the DB missed)
-	oracleService, err := NewOracleService()
+	oracleService, err := s.oracleService()
 	if err == nil {
 		isScam, err := oracleService.IsConfirmedScam(normAddr)
 		if err == nil && isScam {
@@ -237,11 +502,11 @@ func (s *AIService) getDAOScamBoost(address string) float64 {
 }
 
 // AnalyzeTransactionEnhanced performs enhanced analysis for high-value transactions
-func (s *AIService) AnalyzeTransactionEnhanced(tx models.Transaction) (float64, error) {
+func (s *AIService) AnalyzeTransactionEnhanced(ctx context.Context, tx models.Transaction) (float64, error) {
 	// For enhanced analysis, we'll use both our base model and additional checks
 
 	// First get base risk score
-	baseRisk, err := s.AnalyzeTransaction(tx)
+	baseRisk, err := s.AnalyzeTransaction(ctx, tx)
 	if err != nil {
 		return 0, fmt.Errorf("base analysis failed: %w", err)
 	}
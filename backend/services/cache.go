@@ -0,0 +1,93 @@
+package services
+
+import (
+	"container/list"
+	"sync"
+	"time"
+)
+
+// TTLCache is a size-bounded in-memory cache whose entries expire after a
+// fixed time-to-live. It is safe for concurrent use.
+//
+// Every entry shares the same TTL, so insertion order is also expiry order:
+// a FIFO list alongside the map lets eviction pop the oldest entry in O(1)
+// instead of scanning the map.
+type TTLCache[K comparable, V any] struct {
+	mu      sync.Mutex
+	entries map[K]*list.Element
+	order   *list.List // front is the oldest (soonest to expire) entry
+	maxSize int
+	ttl     time.Duration
+}
+
+type ttlEntry[K comparable, V any] struct {
+	key       K
+	value     V
+	expiresAt time.Time
+}
+
+// NewTTLCache creates a cache holding at most maxSize entries for ttl each
+func NewTTLCache[K comparable, V any](maxSize int, ttl time.Duration) *TTLCache[K, V] {
+	return &TTLCache[K, V]{
+		entries: make(map[K]*list.Element),
+		order:   list.New(),
+		maxSize: maxSize,
+		ttl:     ttl,
+	}
+}
+
+// Get returns the cached value for key if it exists and has not expired
+func (c *TTLCache[K, V]) Get(key K) (V, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	elem, ok := c.entries[key]
+	if !ok {
+		var zero V
+		return zero, false
+	}
+	entry := elem.Value.(*ttlEntry[K, V])
+	if time.Now().After(entry.expiresAt) {
+		c.remove(elem)
+		var zero V
+		return zero, false
+	}
+	return entry.value, true
+}
+
+// Set stores value under key with a fresh TTL. When the cache is full the
+// oldest entry is evicted, which is always the next one due to expire.
+func (c *TTLCache[K, V]) Set(key K, value V) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	now := time.Now()
+	expiresAt := now.Add(c.ttl)
+
+	if elem, ok := c.entries[key]; ok {
+		// Refreshing the TTL makes this the newest entry, keeping the FIFO
+		// in expiry order
+		entry := elem.Value.(*ttlEntry[K, V])
+		entry.value = value
+		entry.expiresAt = expiresAt
+		c.order.MoveToBack(elem)
+		return
+	}
+
+	// Drop expired entries from the front, then the oldest live one if the
+	// cache is still full
+	for front := c.order.Front(); front != nil; front = c.order.Front() {
+		if len(c.entries) < c.maxSize && !now.After(front.Value.(*ttlEntry[K, V]).expiresAt) {
+			break
+		}
+		c.remove(front)
+	}
+
+	c.entries[key] = c.order.PushBack(&ttlEntry[K, V]{key: key, value: value, expiresAt: expiresAt})
+}
+
+// remove deletes elem from both the FIFO and the index. Callers hold c.mu.
+func (c *TTLCache[K, V]) remove(elem *list.Element) {
+	c.order.Remove(elem)
+	delete(c.entries, elem.Value.(*ttlEntry[K, V]).key)
+}
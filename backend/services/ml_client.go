@@ -0,0 +1,152 @@
+package services
+
+import (
+	"context"
+	"errors"
+	"io"
+	"net"
+	"net/http"
+	"time"
+)
+
+// ML API connection pool settings. The Render endpoint is a single host, so
+// the per-host idle limit is what actually governs keep-alive reuse (the
+// net/http default of 2 forces a fresh TCP+TLS handshake under any burst).
+const (
+	mlMaxIdleConnsPerHost = 50
+	mlIdleConnTimeout     = 90 * time.Second
+	mlConnectTimeout      = 3 * time.Second
+	mlRequestTimeout      = 30 * time.Second
+	mlMaxConcurrent       = 20
+	mlMaxRetries          = 2
+	mlRetryBackoff        = 300 * time.Millisecond
+	mlMaxDrainBytes       = 64 << 10
+)
+
+// mlHTTPClient is shared by every AIService so all ML traffic from this
+// process draws on one warm connection pool.
+var mlHTTPClient = newMLHTTPClient()
+
+// mlSlots bounds concurrent upstream ML calls. Render's free tier
+// cold-starts slowly; queueing extra callers for a warm pooled connection
+// keeps a burst from timing out together on a waking instance.
+var mlSlots = make(chan struct{}, mlMaxConcurrent)
+
+// acquireMLSlot blocks until an upstream slot is free or ctx is done.
+// The returned function releases the slot.
+func acquireMLSlot(ctx context.Context) (func(), error) {
+	select {
+	case mlSlots <- struct{}{}:
+		return func() { <-mlSlots }, nil
+	case <-ctx.Done():
+		return nil, ctx.Err()
+	}
+}
+
+// newMLHTTPClient builds the pooled HTTP client used to reach the ML API.
+// Connections are kept alive between predictions (multiplexed over HTTP/2
+// where the server supports it). Connect failures and transient gateway
+// errors from Render (502/503/504) are retried with exponential backoff, all
+// within the overall request timeout. There is no per-attempt response
+// timeout: a cold-starting free-tier instance can take most of
+// mlRequestTimeout to answer, and that answer is still worth waiting for.
+func newMLHTTPClient() *http.Client {
+	transport := &http.Transport{
+		Proxy: http.ProxyFromEnvironment,
+		DialContext: (&net.Dialer{
+			Timeout:   mlConnectTimeout,
+			KeepAlive: 30 * time.Second,
+		}).DialContext,
+		// A custom DialContext turns off net/http's automatic HTTP/2, so opt
+		// back in: concurrent predictions then multiplex over one TLS
+		// connection when Render negotiates h2, falling back to HTTP/1.1.
+		ForceAttemptHTTP2:     true,
+		MaxIdleConns:          mlMaxIdleConnsPerHost,
+		MaxIdleConnsPerHost:   mlMaxIdleConnsPerHost,
+		IdleConnTimeout:       mlIdleConnTimeout,
+		TLSHandshakeTimeout:   10 * time.Second,
+		ExpectContinueTimeout: 1 * time.Second,
+	}
+
+	return &http.Client{
+		Timeout: mlRequestTimeout,
+		Transport: &retryTransport{
+			base:       transport,
+			maxRetries: mlMaxRetries,
+			backoff:    mlRetryBackoff,
+		},
+	}
+}
+
+// retryTransport retries requests that fail to connect or return a
+// retryable gateway status. Slow responses are not retried; replaying them
+// would only add load to an upstream that is already struggling. Requests
+// are only replayed when their body can be rewound via GetBody, which
+// http.NewRequest sets for bytes.Buffer/bytes.Reader bodies. Predictions
+// are idempotent, so replaying a POST is safe here.
+type retryTransport struct {
+	base       http.RoundTripper
+	maxRetries int
+	backoff    time.Duration
+}
+
+// RoundTrip implements http.RoundTripper
+func (t *retryTransport) RoundTrip(req *http.Request) (*http.Response, error) {
+	for attempt := 0; ; attempt++ {
+		resp, err := t.base.RoundTrip(req)
+		if attempt >= t.maxRetries || !isRetryable(resp, err) || req.Context().Err() != nil {
+			return resp, err
+		}
+		if req.Body != nil && req.GetBody == nil {
+			return resp, err
+		}
+
+		if resp != nil {
+			drainAndClose(resp.Body)
+		}
+
+		select {
+		case <-time.After(t.backoff << attempt):
+		case <-req.Context().Done():
+			return nil, req.Context().Err()
+		}
+
+		retry := req.Clone(req.Context())
+		if req.GetBody != nil {
+			body, err := req.GetBody()
+			if err != nil {
+				return nil, err
+			}
+			retry.Body = body
+		}
+		req = retry
+	}
+}
+
+// isRetryable reports whether a round trip failed in a way worth retrying:
+// a dial failure (including a connect timeout) or a retryable upstream status
+func isRetryable(resp *http.Response, err error) bool {
+	if err != nil {
+		var opErr *net.OpError
+		return errors.As(err, &opErr) && opErr.Op == "dial"
+	}
+	return isRetryableStatus(resp.StatusCode)
+}
+
+// isRetryableStatus reports whether an upstream status is worth retrying
+func isRetryableStatus(code int) bool {
+	switch code {
+	case http.StatusBadGateway, http.StatusServiceUnavailable, http.StatusGatewayTimeout:
+		return true
+	}
+	return false
+}
+
+// drainAndClose discards any unread bytes before closing a response body so
+// the connection goes back to the pool. json.Decoder stops at the end of the
+// first value and can leave a trailing newline or chunk terminator unread,
+// which would otherwise force net/http to tear the connection down.
+func drainAndClose(body io.ReadCloser) {
+	io.Copy(io.Discard, io.LimitReader(body, mlMaxDrainBytes))
+	body.Close()
+}
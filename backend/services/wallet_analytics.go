@@ -296,23 +296,27 @@ type ScamHistory struct {
 
 // GetAddressScamHistory retrieves the scam history for an address
 func (s *WalletAnalyticsService) GetAddressScamHistory(address string) (*ScamHistory, error) {
-	var history ScamHistory
-
-	// Query scam reports for this address
-	var reports []models.Report
-	err := s.db.Where("scammer_address = ? AND status = ?", address, "confirmed").
-		Order("created_at desc").
-		Find(&reports).Error
+	// Aggregate confirmed scam reports for this address in the database
+	// rather than decoding every report row
+	var summary struct {
+		ScamCount       int
+		TotalScamAmount float64
+		LastReportTime  *time.Time
+	}
+	err := s.db.Model(&models.Report{}).
+		Select("COUNT(*) AS scam_count, COALESCE(SUM(amount), 0) AS total_scam_amount, MAX(created_at) AS last_report_time").
+		Where("scammer_address = ? AND status = ?", address, "confirmed").
+		Scan(&summary).Error
 	if err != nil {
 		return nil, fmt.Errorf("failed to query scam reports: %w", err)
 	}
 
-	history.ScamCount = len(reports)
-	if history.ScamCount > 0 {
-		history.LastScamReportTime = reports[0].CreatedAt
-		for _, report := range reports {
-			history.TotalScamAmount += report.Amount
-		}
+	history := ScamHistory{
+		ScamCount:       summary.ScamCount,
+		TotalScamAmount: summary.TotalScamAmount,
+	}
+	if summary.LastReportTime != nil {
+		history.LastScamReportTime = *summary.LastReportTime
 	}
 
 	return &history, nil
@@ -320,27 +324,33 @@ func (s *WalletAnalyticsService) GetAddressScamHistory(address string) (*ScamHis
 
 // IsUnusualTransaction checks if a transaction shows unusual patterns
 func (s *WalletAnalyticsService) IsUnusualTransaction(tx models.Transaction) (bool, error) {
-	// Get recent transactions for the sender
+	// Get recent transactions for the sender. Only the value and recipient
+	// are inspected, so skip decoding the other columns (metadata is jsonb).
 	var recentTxs []models.Transaction
-	err := s.db.Where("from_address = ? AND created_at > ?",
-		tx.FromAddress, time.Now().Add(-24*time.Hour)).
-		Order("created_at desc").
+	err := s.db.Select("value", "to_address").
+		Where("from_address = ? AND created_at > ?",
+			tx.FromAddress, time.Now().Add(-24*time.Hour)).
 		Find(&recentTxs).Error
 	if err != nil {
 		return false, fmt.Errorf("failed to query recent transactions: %w", err)
 	}
 
-	// Calculate average transaction value
-	var totalValue float64
-	for _, rtx := range recentTxs {
-		totalValue += rtx.Value
-	}
-
 	if len(recentTxs) == 0 {
 		// First transaction in 24 hours is considered unusual
 		return true, nil
 	}
 
+	// Calculate average transaction value and check for a known recipient
+	// in the same pass
+	var totalValue float64
+	knownRecipient := false
+	for _, rtx := range recentTxs {
+		totalValue += rtx.Value
+		if rtx.ToAddress == tx.ToAddress {
+			knownRecipient = true
+		}
+	}
+
 	avgValue := totalValue / float64(len(recentTxs))
 
 	// Check if this transaction is significantly larger than average
@@ -348,14 +358,6 @@ func (s *WalletAnalyticsService) IsUnusualTransaction(tx models.Transaction) (bo
 		return true, nil
 	}
 
-	// Check if this is a new recipient
-	for _, rtx := range recentTxs {
-		if rtx.ToAddress == tx.ToAddress {
-			// Not a new recipient
-			return false, nil
-		}
-	}
-
 	// New recipient is considered unusual
-	return true, nil
+	return !knownRecipient, nil
 }
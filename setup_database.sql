@@ -28,6 +28,9 @@ CREATE INDEX IF NOT EXISTS idx_transactions_from_address ON transactions(from_ad
 CREATE INDEX IF NOT EXISTS idx_transactions_to_address ON transactions(to_address);
 CREATE INDEX IF NOT EXISTS idx_transactions_tx_hash ON transactions(tx_hash);
 CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions(timestamp);
+-- Composite indexes so per-address history can be read newest-first straight off the index
+CREATE INDEX IF NOT EXISTS idx_transactions_from_created ON transactions(from_address, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_to_created ON transactions(to_address, created_at DESC);
 
 -- Create reports table
 CREATE TABLE IF NOT EXISTS reports (